@@ -23,11 +23,12 @@ from __future__ import annotations
 import logging
 from abc import ABCMeta, abstractmethod
 from collections.abc import AsyncIterable, Iterable
-from typing import Generic, TypeVar, final
+from typing import Generic, TypeVar, cast, final
 
 from pytools.asyncio import arun, iter_sync_to_async
 
 from .core import AtomicConduit, SerialProcessor
+from .core._base import _get_simple_module
 
 log = logging.getLogger(__name__)
 
@@ -64,6 +65,8 @@ class Consumer(
     object.
     """
 
+    _kind = "consumer"
+
     @final
     def process(self, input: Iterable[T_SourceProduct_arg]) -> T_Output_ret:
         """
@@ -72,11 +75,8 @@ class Consumer(
         :param input: the products to consume
         :return: the resulting object
         """
-        from .simple import SimpleProducer
-
-        return (
-            SimpleProducer[self.input_type](input) >> self  # type: ignore[name-defined]
-        ).run()
+        producer = _get_simple_module().SimpleProducer[self.input_type](input)
+        return cast(T_Output_ret, (producer >> self).run())
 
     @final
     async def aprocess(self, input: AsyncIterable[T_SourceProduct_arg]) -> T_Output_ret:
@@ -86,12 +86,8 @@ class Consumer(
         :param input: the products to consume
         :return: the resulting object
         """
-        from .simple import SimpleAsyncProducer
-
-        return await (
-            SimpleAsyncProducer[self.input_type](input)  # type: ignore[name-defined]
-            >> self
-        ).arun()
+        producer = _get_simple_module().SimpleAsyncProducer[self.input_type](input)
+        return cast(T_Output_ret, await (producer >> self).arun())
 
     @abstractmethod
     def consume(
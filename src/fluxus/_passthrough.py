@@ -58,6 +58,8 @@ class Passthrough(SerialConduit[Any], metaclass=SingletonABCMeta):
     Chaining a pass-through object with a transformer yields the original transformer.
     """
 
+    _kind = "passthrough"
+
     @property
     def is_chained(self) -> bool:
         """
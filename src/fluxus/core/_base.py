@@ -33,6 +33,7 @@ from collections.abc import (
     Iterable,
     Iterator,
 )
+from types import ModuleType
 from typing import Any, Generic, TypeVar, cast, final
 
 from pytools.api import inheritdoc
@@ -62,6 +63,19 @@ T_Product_ret = TypeVar("T_Product_ret", covariant=True)
 T_Output_ret = TypeVar("T_Output_ret", covariant=True)
 
 
+#
+# Lazily imported modules
+#
+
+#: The :mod:`fluxus.simple` module, imported upon first use to avoid circular imports.
+_simple_module: ModuleType | None = None
+
+
+#
+# Classes
+#
+
+
 class Source(Conduit[T_Product_ret], Generic[T_Product_ret], metaclass=ABCMeta):
     """
     A conduit that produces or transforms products.
@@ -89,6 +103,10 @@ class Processor(
     This is a base class for :class:`.Transformer` and :class:`.Consumer`.
     """
 
+    #: ``True`` if this processor passes on its input products unchanged; identity
+    #: processors are dropped when chained with other transformers.
+    _is_identity: bool = False
+
     @property
     def input_type(self) -> type[T_SourceProduct_arg]:
         """
@@ -181,3 +199,23 @@ class SerialProcessor(
         """[see superclass]"""
         for conduit in ingoing:
             yield conduit, self
+
+
+#
+# Auxiliary functions
+#
+
+
+def _get_simple_module() -> ModuleType:
+    """
+    Get the :mod:`fluxus.simple` module, importing it upon first use.
+
+    :return: the :mod:`fluxus.simple` module
+    """
+    global _simple_module
+    if _simple_module is None:
+        # We import locally to avoid circular imports
+        from .. import simple
+
+        _simple_module = simple
+    return _simple_module
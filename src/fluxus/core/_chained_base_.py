@@ -20,7 +20,9 @@ Implementation of composition classes.
 
 from __future__ import annotations
 
+import functools
 import logging
+import operator
 from abc import ABCMeta, abstractmethod
 from collections.abc import Collection, Iterator
 from typing import Any, Generic, TypeVar, cast, final
@@ -58,6 +60,20 @@ class _ChainedConduit(
     as the source and the other processing the output of the source.
     """
 
+    #: Cache for the connections of this conduit, keyed by the identities of the
+    #: ingoing conduits; each entry also holds on to the ingoing conduits, so that
+    #: their identities cannot be reused while the entry exists.
+    _connections_cache: (
+        dict[
+            tuple[int, ...],
+            tuple[
+                tuple[SerialConduit[Any], ...],
+                tuple[tuple[SerialConduit[Any], SerialConduit[Any]], ...],
+            ],
+        ]
+        | None
+    ) = None
+
     @property
     @final
     def is_chained(self) -> bool:
@@ -81,13 +97,39 @@ class _ChainedConduit(
         :attr:`.source` conduit.
         """
 
+    @functools.cached_property
+    def _has_passthrough(self) -> bool:
+        """
+        ``True`` if both the source and the processor of this conduit contain a
+        passthrough, so that products can pass through the chain unchanged;
+        ``False`` otherwise.
+
+        Determined only once, since chained conduits are immutable once composed.
+        """
+        return self.source._has_passthrough and self.processor._has_passthrough
+
     def get_final_conduits(self) -> Iterator[SerialConduit[T_Output_ret]]:
         """[see superclass]"""
+        return iter(self._final_conduits_tuple)
+
+    @functools.cached_property
+    def _final_conduits_tuple(self) -> tuple[SerialConduit[T_Output_ret], ...]:
+        """
+        The final conduits of this conduit.
+
+        Chained conduits are immutable once composed, so the final conduits are
+        determined only once.
+        """
+        final_conduits = _get_final_conduits_tuple(self.processor)
         if self.processor._has_passthrough:
-            yield from cast(
-                Iterator[SerialConduit[T_Output_ret]], self.source.get_final_conduits()
+            final_conduits = (
+                cast(
+                    tuple[SerialConduit[T_Output_ret], ...],
+                    _get_final_conduits_tuple(self.source),
+                )
+                + final_conduits
             )
-        yield from self.processor.get_final_conduits()
+        return final_conduits
 
     def get_connections(
         self, *, ingoing: Collection[SerialConduit[Any]]
@@ -95,20 +137,50 @@ class _ChainedConduit(
         """
         Get all conduit-to-conduit connections in the flow leading up to this conduit.
 
+        The connections are determined only once for any given ingoing conduits, since
+        chained conduits are immutable once composed.
+
+        :param ingoing: the ingoing conduits, if any
         :return: an iterable of connections
         """
+        ingoing = tuple(ingoing)
+        # We key the cache by identity, since conduits need not be hashable, and
+        # equal conduits must not share connections
+        key = tuple(map(id, ingoing))
+        connections_cache = self._connections_cache
+        if connections_cache is None:
+            self._connections_cache = connections_cache = {}
+        try:
+            _, connections = connections_cache[key]
+        except KeyError:
+            connections = tuple(self._iter_connections(ingoing=ingoing))
+            connections_cache[key] = (ingoing, connections)
+        return iter(connections)
+
+    def _iter_connections(
+        self, *, ingoing: Collection[SerialConduit[Any]]
+    ) -> Iterator[tuple[SerialConduit[Any], SerialConduit[Any]]]:
+        """
+        Iterate over all conduit-to-conduit connections in the flow leading up to this
+        conduit, without caching.
+
+        :param ingoing: the ingoing conduits, if any
+        :return: an iterator of connections
+        """
         source = self.source
         processor = self.processor
 
         # We first yield all connections from within the source
         yield from source.get_connections(ingoing=ingoing)
 
-        # We get the list of all ingoing conduits of the processor
-        processor_ingoing = list(source.get_final_conduits())
+        # We get all ingoing conduits of the processor
+        processor_ingoing: Collection[SerialConduit[Any]] = _get_final_conduits_tuple(
+            source
+        )
 
         # If the source includes a pass-through, we add the original ingoing conduits
-        if source._has_passthrough:
-            processor_ingoing.extend(ingoing)
+        if ingoing and source._has_passthrough:
+            processor_ingoing = (*processor_ingoing, *ingoing)
 
         # Then we get all connections of the processor, including ingoing connections
         yield from processor.get_connections(ingoing=processor_ingoing)
@@ -120,9 +192,36 @@ class _ChainedConduit(
 
     def to_expression(self, *, compact: bool = False) -> Expression:
         """[see superclass]"""
-        return self.source.to_expression(
-            compact=compact
-        ) >> self.processor.to_expression(compact=compact)
+        return functools.reduce(
+            operator.rshift,
+            (stage.to_expression(compact=compact) for stage in self._stages),
+        )
+
+    @functools.cached_property
+    def _stages(self) -> tuple[Conduit[Any], ...]:
+        """
+        The stages of this chain, determined only once since chained conduits are
+        immutable once composed.
+        """
+        return tuple(self._iter_stages())
+
+    def _iter_stages(self) -> Iterator[Conduit[Any]]:
+        """
+        Iterate over the stages of this chain, starting with the initial source and
+        ending with the final processor, without caching.
+
+        Descends iteratively along the chain of sources, so that the stages of long
+        chains can be determined without recursion.
+
+        :return: an iterator of the stages
+        """
+        processors: list[Conduit[Any]] = []
+        node: Conduit[Any] = self
+        while isinstance(node, _ChainedConduit):
+            processors.append(node.processor)
+            node = node.source
+        yield node
+        yield from reversed(processors)
 
 
 class _SerialChainedConduit(
@@ -145,5 +244,43 @@ class _SerialChainedConduit(
         """
         The chained conduits in the flow leading up to this conduit.
         """
-        yield from self.source.chained_conduits
-        yield self.final_conduit
+        return iter(self._chained_conduits_tuple)
+
+    @functools.cached_property
+    def _chained_conduits_tuple(self) -> tuple[SerialConduit[Any], ...]:
+        """
+        The chained conduits in the flow leading up to this conduit, determined only
+        once since chained conduits are immutable once composed.
+        """
+        return tuple(self._iter_chained_conduits())
+
+    def _iter_chained_conduits(self) -> Iterator[SerialConduit[Any]]:
+        """
+        Iterate over the chained conduits in the flow leading up to this conduit,
+        without caching.
+
+        :return: an iterator of the chained conduits
+        """
+        for stage in cast(tuple[SerialConduit[Any], ...], self._stages):
+            yield from stage.chained_conduits
+
+
+#
+# Auxiliary functions
+#
+
+
+def _get_final_conduits_tuple(
+    conduit: Conduit[T_Output_ret],
+) -> tuple[SerialConduit[T_Output_ret], ...]:
+    """
+    Get the final conduits of the given conduit as a tuple, reusing the cached tuple
+    of chained conduits.
+
+    :param conduit: the conduit to get the final conduits of
+    :return: the final conduits
+    """
+    if isinstance(conduit, _ChainedConduit):
+        return conduit._final_conduits_tuple
+    else:
+        return tuple(conduit.get_final_conduits())
@@ -20,10 +20,11 @@ Implementation of conduit and subconduit base classes
 
 from __future__ import annotations
 
+import functools
 import logging
 from abc import ABCMeta, abstractmethod
 from collections.abc import Collection, Iterator, Mapping
-from typing import Any, Generic, TypeVar, final
+from typing import Any, Generic, TypeVar, final, get_args
 
 from typing_extensions import Self
 
@@ -34,7 +35,7 @@ from pytools.expression import (
     expression_from_init_params,
 )
 from pytools.expression.atomic import Id
-from pytools.typing import get_type_arguments
+from pytools.typing import get_generic_instance
 
 from ..util import simplify_repr_attributes
 
@@ -223,7 +224,9 @@ class Conduit(HasExpressionRepr, Generic[T_Output_ret], metaclass=ABCMeta):
         :raises TypeError: if the type arguments are ambiguous due to multiple
             inheritance
         """
-        args = get_type_arguments(self, base)
+        # Instances of generic aliases, e.g., SimpleProducer[int](...), carry their
+        # type arguments in their __orig_class__ attribute
+        args = _get_type_arguments(getattr(self, "__orig_class__", type(self)), base)
         if len(args) > 1:
             raise TypeError(
                 f"Ambiguous type arguments for {self.name} with respect to "
@@ -338,3 +341,24 @@ class AtomicConduit(
     def get_isolated_conduits(self) -> Iterator[SerialConduit[T_Product_ret]]:
         """[see superclass]"""
         yield self
+
+
+#
+# Auxiliary functions
+#
+
+
+@functools.lru_cache(maxsize=4096)
+def _get_type_arguments(generic_type: type, base: type) -> tuple[tuple[type, ...], ...]:
+    """
+    Get the type arguments of the given generic type with respect to the given base
+    class.
+
+    Cached, since the type arguments only depend on the generic type of a conduit,
+    and resolving them requires walking the class hierarchy.
+
+    :param generic_type: the class or generic alias of a conduit
+    :param base: the base class to get the type arguments for
+    :return: the type arguments for each generic instance of the base class
+    """
+    return tuple(map(get_args, get_generic_instance(generic_type, base)))
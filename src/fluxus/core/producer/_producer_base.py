@@ -20,13 +20,19 @@ Implementation of conduit base classes.
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from abc import ABCMeta, abstractmethod
-from collections.abc import AsyncIterator, Iterator
-from typing import Generic, TypeVar, cast, final
+from collections.abc import (
+    AsyncIterator,
+    Callable,
+    Collection,
+    Iterable,
+    Iterator,
+)
+from typing import Any, ClassVar, Generic, TypeVar, cast, final
 
 from pytools.api import inheritdoc
-from pytools.asyncio import async_flatten, iter_sync_to_async
 from pytools.typing import get_common_generic_base
 
 from ..._consumer import Consumer
@@ -52,6 +58,23 @@ __all__ = [
 T_Product_ret = TypeVar("T_Product_ret", covariant=True)
 T_Output_ret = TypeVar("T_Output_ret", covariant=True)
 
+
+#
+# Constants
+#
+
+#: Sentinel indicating that a worker has finished producing products.
+_END = object()
+
+#: Sentinel indicating that a worker has failed with an exception.
+_FAILED = object()
+
+#: Rules for composing producers with other conduits, mapping the kind of the left
+#: operand, the operator, and the kind of the right operand to a function creating the
+#: composite conduit; populated upon first use to avoid circular imports.
+_COMPOSE_RULES: dict[tuple[str, str, str | None], Callable[[Any, Any], Any]] = {}
+
+
 #
 # Classes
 #
@@ -63,6 +86,10 @@ class BaseProducer(Source[T_Product_ret], Generic[T_Product_ret], metaclass=ABCM
     :class:`.Producer` or a :class:`.ConcurrentProducer`.
     """
 
+    #: The kind of this producer, used to look up the rules for composing it with
+    #: other conduits.
+    _kind: ClassVar[str]
+
     @abstractmethod
     def produce(self) -> Iterator[T_Product_ret]:
         """
@@ -99,32 +126,15 @@ class BaseProducer(Source[T_Product_ret], Generic[T_Product_ret], metaclass=ABCM
     def __and__(
         self, other: BaseProducer[T_Product_ret]
     ) -> ConcurrentProducer[T_Product_ret]:
-
-        if isinstance(other, BaseProducer):
-            from . import SimpleConcurrentProducer
-
-            # We determine the type hint at runtime, and use a type cast to
-            # indicate the type for static type checks
-            return cast(
-                ConcurrentProducer[T_Product_ret],
-                SimpleConcurrentProducer[  # type: ignore[misc, operator]
-                    get_common_generic_base((self.product_type, other.product_type))
-                ](self, other),
-            )
-        else:
-            return NotImplemented
+        rule = _get_compose_rule(self, "&", other)
+        return NotImplemented if rule is None else rule(self, other)
 
     def __rshift__(
         self,
         other: Consumer[T_Product_ret, T_Output_ret],
     ) -> Flow[T_Output_ret]:
-        if isinstance(other, Consumer):
-            # We import locally to avoid circular imports
-            from ._chained_ import _ProducerGroupFlow
-
-            return _ProducerGroupFlow(producer=self, consumer=other)
-        else:
-            return NotImplemented
+        rule = _get_compose_rule(self, ">>", other)
+        return NotImplemented if rule is None else rule(self, other)
 
 
 @inheritdoc(match="[see superclass]")
@@ -141,6 +151,8 @@ class SerialProducer(
     It can run synchronously or asynchronously.
     """
 
+    _kind = "serial_producer"
+
     def iter_concurrent_producers(self) -> Iterator[SerialProducer[T_Product_ret]]:
         """[see superclass]"""
         yield self
@@ -156,18 +168,6 @@ class SerialProducer(
         for product in self.produce():
             yield product
 
-    def __rshift__(
-        self,
-        other: Consumer[T_Product_ret, T_Output_ret],
-    ) -> Flow[T_Output_ret]:
-        if isinstance(other, Consumer):
-            # We import locally to avoid circular imports
-            from ._chained_ import _ProducerFlow
-
-            return _ProducerFlow(producer=self, consumer=other)
-        else:
-            return NotImplemented
-
 
 class ConcurrentProducer(
     ConcurrentConduit[T_Product_ret],
@@ -177,15 +177,29 @@ class ConcurrentProducer(
 ):
     """
     A collection of one or more producers.
+
+    When iterated asynchronously, the producers run concurrently and pass their
+    products to a bounded buffer, from which the products are retrieved in the order
+    in which they were produced. Producers are suspended while the buffer is full,
+    limiting memory usage when products are generated faster than they are consumed.
     """
 
+    _kind = "concurrent_producer"
+
+    #: The maximum number of products buffered during asynchronous iteration.
+    buffer_size: int = 64
+
+    #: The maximum number of producers running concurrently during asynchronous
+    #: iteration; ``None`` to run all producers concurrently.
+    num_workers: int | None = None
+
     def produce(self) -> Iterator[T_Product_ret]:
         """
         Generate new products from all producers in this group.
 
         :return: an iterator of the new products
         """
-        for producer in self.iter_concurrent_producers():
+        for producer in self._get_concurrent_producers():
             yield from producer
 
     def aproduce(self) -> AsyncIterator[T_Product_ret]:
@@ -194,8 +208,202 @@ class ConcurrentProducer(
 
         :return: an async iterator of the new products
         """
-        # noinspection PyTypeChecker
-        return async_flatten(
-            producer.aproduce()
-            async for producer in iter_sync_to_async(self.iter_concurrent_producers())
+        return _aproduce(
+            self._get_concurrent_producers(),
+            buffer_size=self.buffer_size,
+            num_workers=self.num_workers,
         )
+
+    def _get_concurrent_producers(self) -> Collection[SerialProducer[T_Product_ret]]:
+        """
+        Get the concurrent producers for a single run of this producer.
+
+        Concurrent producers may share state across a single run, so by default a
+        new collection of producers is created on every call. Subclasses may return
+        the same collection on every call if its producers are stateless.
+
+        :return: the concurrent producers
+        """
+        return tuple(self.iter_concurrent_producers())
+
+
+#
+# Auxiliary functions
+#
+
+
+def _get_compose_rule(
+    lhs: BaseProducer[Any], operator: str, rhs: Any
+) -> Callable[[Any, Any], Any] | None:
+    """
+    Look up the rule for composing the given producer with another operand.
+
+    :param lhs: the producer on the left of the operator
+    :param operator: the operator, either ``"&"`` or ``">>"``
+    :param rhs: the operand on the right of the operator
+    :return: the function creating the composite conduit, or ``None`` if the operands
+        cannot be composed using the given operator
+    """
+    if not _COMPOSE_RULES:
+        _COMPOSE_RULES.update(_make_compose_rules())
+    return _COMPOSE_RULES.get((lhs._kind, operator, getattr(type(rhs), "_kind", None)))
+
+
+def _make_compose_rules() -> (
+    dict[tuple[str, str, str | None], Callable[[Any, Any], Any]]
+):
+    """
+    Create the rules for composing producers with other conduits.
+
+    :return: the composition rules
+    """
+    # We import locally to avoid circular imports
+    from ._chained_ import _ProducerFlow, _ProducerGroupFlow
+    from ._simple import SimpleConcurrentProducer
+
+    def _group(
+        first: BaseProducer[T_Product_ret], second: BaseProducer[T_Product_ret]
+    ) -> ConcurrentProducer[T_Product_ret]:
+        # We determine the type hint at runtime, and use a type cast to
+        # indicate the type for static type checks
+        return cast(
+            ConcurrentProducer[T_Product_ret],
+            SimpleConcurrentProducer[  # type: ignore[misc, operator]
+                get_common_generic_base((first.product_type, second.product_type))
+            ](first, second),
+        )
+
+    kinds = ("serial_producer", "concurrent_producer")
+    rules: dict[tuple[str, str, str | None], Callable[[Any, Any], Any]] = {
+        (lhs, "&", rhs): _group for lhs in kinds for rhs in kinds
+    }
+    rules["serial_producer", ">>", "consumer"] = lambda producer, consumer: (
+        _ProducerFlow(producer=producer, consumer=consumer)
+    )
+    rules["concurrent_producer", ">>", "consumer"] = lambda producer, consumer: (
+        _ProducerGroupFlow(producer=producer, consumer=consumer)
+    )
+    return rules
+
+
+def _aproduce(
+    producers: Collection[SerialProducer[T_Product_ret]],
+    *,
+    buffer_size: int,
+    num_workers: int | None,
+) -> AsyncIterator[T_Product_ret]:
+    """
+    Generate the products of the given concurrent producers asynchronously.
+
+    :param producers: the producers to generate products from
+    :param buffer_size: the maximum number of buffered products
+    :param num_workers: the maximum number of producers to run concurrently, or
+        ``None`` to run all producers concurrently
+    :return: an async iterator of the products
+    :raises ValueError: if the buffer size or the number of workers is not positive
+    """
+    if buffer_size < 1:
+        raise ValueError(f"arg buffer_size must be positive, but got: {buffer_size}")
+    if num_workers is not None and num_workers < 1:
+        raise ValueError(
+            f"arg num_workers must be positive or None, but got: {num_workers}"
+        )
+    if all(
+        type(producer).aproduce is SerialProducer.aproduce for producer in producers
+    ):
+        # The default aproduce method defers to the synchronous produce method,
+        # so there is nothing to be gained from running producers concurrently
+        return _aproduce_sync(producers)
+    return _aproduce_concurrent(
+        producers, buffer_size=buffer_size, num_workers=num_workers
+    )
+
+
+async def _aproduce_sync(
+    producers: Iterable[SerialProducer[T_Product_ret]],
+) -> AsyncIterator[T_Product_ret]:
+    """
+    Generate the products of the given producers in a single async generator, using
+    their synchronous produce methods.
+
+    :param producers: the producers to generate products from
+    :return: an async iterator of the products
+    """
+    for producer in producers:
+        for product in producer.produce():
+            yield product
+
+
+async def _aproduce_concurrent(
+    producers: Collection[SerialProducer[T_Product_ret]],
+    *,
+    buffer_size: int,
+    num_workers: int | None,
+) -> AsyncIterator[T_Product_ret]:
+    """
+    Generate the products of the given producers concurrently, using a bounded buffer
+    to pass the products to the caller.
+
+    :param producers: the producers to generate products from
+    :param buffer_size: the maximum number of buffered products
+    :param num_workers: the maximum number of producers to run concurrently, or
+        ``None`` to run all producers concurrently
+    :return: an async iterator of the products, in the order they were produced
+    """
+    buffer: asyncio.Queue[T_Product_ret | object] = asyncio.Queue(maxsize=buffer_size)
+    producers_iter = iter(producers)
+    errors: list[BaseException] = []
+    stopping = False
+
+    async def _worker() -> None:
+        # Run the remaining producers one after the other, sharing them with the
+        # other workers
+        try:
+            for producer in producers_iter:
+                if type(producer).aproduce is SerialProducer.aproduce:
+                    # The default aproduce method defers to the synchronous produce
+                    # method, so we iterate the products directly
+                    for product in producer.produce():
+                        await buffer.put(product)
+                else:
+                    async for product in producer.aproduce():
+                        await buffer.put(product)
+        except BaseException as error:
+            if stopping:
+                # The consumer has cancelled the workers and no longer reads from
+                # the buffer
+                raise
+            # Discard the buffered products and pass the error on to the consumer
+            # right away, instead of waiting for the other workers to finish; this
+            # includes cancellation errors not caused by the consumer, e.g., from
+            # awaiting a cancelled task
+            errors.append(error)
+            while not buffer.empty():
+                buffer.get_nowait()
+            buffer.put_nowait(_FAILED)
+        else:
+            # Not reached if the worker is cancelled, since a cancelled worker could
+            # otherwise block forever on a full buffer
+            await buffer.put(_END)
+
+    n_workers = len(producers) if num_workers is None else num_workers
+    workers = [
+        asyncio.create_task(_worker()) for _ in range(min(n_workers, len(producers)))
+    ]
+    try:
+        n_active = len(workers)
+        while n_active:
+            product = await buffer.get()
+            if product is _END:
+                n_active -= 1
+            elif product is _FAILED:
+                raise errors[0]
+            else:
+                yield cast(T_Product_ret, product)
+    finally:
+        # Stop the workers if iteration failed or ended early, and wait for them to
+        # finish
+        stopping = True
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
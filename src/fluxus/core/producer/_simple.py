@@ -74,6 +74,10 @@ class SimpleConcurrentProducer(
     #: The response sources this producer provides.
     producers: tuple[BaseProducer[T_SourceProduct_ret], ...]
 
+    #: The producers of this group if they are all serial producers, in which case
+    #: they are the concurrent producers of this group; ``None`` otherwise.
+    _serial_producers: tuple[SerialProducer[T_SourceProduct_ret], ...] | None
+
     def __init__(
         self,
         *producers: BaseProducer[T_SourceProduct_ret],
@@ -95,6 +99,11 @@ class SimpleConcurrentProducer(
             ),
             arg_name="producers",
         )
+        self._serial_producers = (
+            cast(tuple[SerialProducer[T_SourceProduct_ret], ...], self.producers)
+            if all(isinstance(producer, SerialProducer) for producer in self.producers)
+            else None
+        )
 
     @property
     def product_type(self) -> type[T_SourceProduct_ret]:
@@ -136,6 +145,14 @@ class SimpleConcurrentProducer(
         for prod in self.producers:
             yield from prod.iter_concurrent_producers()
 
+    def _get_concurrent_producers(
+        self,
+    ) -> Collection[SerialProducer[T_SourceProduct_ret]]:
+        """[see superclass]"""
+        # Serial producers are their own concurrent producers, so we can reuse them
+        # across runs
+        return self._serial_producers or super()._get_concurrent_producers()
+
     def to_expression(self, *, compact: bool = False) -> Expression:
         """[see superclass]"""
         return functools.reduce(
@@ -20,18 +20,38 @@ Implementation of composition classes.
 
 from __future__ import annotations
 
+import functools
+import itertools
 import logging
-from collections.abc import AsyncIterator, Iterator
-from typing import Generic, TypeVar, final
+from collections.abc import (
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Collection,
+    Iterable,
+    Iterator,
+    Sequence,
+)
+from typing import Any, Generic, TypeVar, cast, final
 
 from pytools.api import inheritdoc
-from pytools.asyncio import async_flatten
+from pytools.asyncio import iter_sync_to_async
 
 from .._base import Processor, Source
-from .._chained_base_ import _ChainedConduit, _SerialChainedConduit
+from .._chained_base_ import (
+    _ChainedConduit,
+    _SerialChainedConduit,
+    _get_final_conduits_tuple,
+)
 from .._conduit import SerialConduit
 from ..producer import BaseProducer, ConcurrentProducer, SerialProducer
-from ._transformer_base import BaseTransformer, ConcurrentTransformer, SerialTransformer
+from ._transformer_base import (
+    BaseTransformer,
+    ConcurrentTransformer,
+    SerialTransformer,
+    _iter_batches,
+    _split_batches,
+)
 
 log = logging.getLogger(__name__)
 
@@ -49,6 +69,26 @@ T_SourceProduct_ret = TypeVar("T_SourceProduct_ret", covariant=True)
 T_SourceProduct_arg = TypeVar("T_SourceProduct_arg", contravariant=True)
 
 
+#
+# Constants
+#
+
+#: The maximum number of stages fused into a single generator function; longer
+#: chains are fused in blocks, since Python limits the number of statically nested
+#: blocks in a function.
+_MAX_FUSED_STAGES = 16
+
+#: Factories for fused transform and process functions, keyed by the single-yield
+#: flags of the fused stages, so that chains of the same shape share compiled code.
+_FUSED_CODE_CACHE: dict[
+    tuple[bool, ...],
+    Callable[
+        ...,
+        tuple[Callable[[Any], Iterator[Any]], Callable[[Iterable[Any]], Iterator[Any]]],
+    ],
+] = {}
+
+
 #
 # Classes
 #
@@ -132,69 +172,227 @@ class _ChainedTransformer(
     Generic[T_SourceProduct_arg, T_SourceProduct_ret, T_TransformedProduct_ret],
 ):
     """
-    A sequential composition of two transformers, with the output of the first serving
-    as input to the second.
+    A sequential composition of two or more transformers, with the output of each
+    transformer serving as input to the next.
+
+    Nested chains are flattened upon construction, so that chaining transformers
+    results in the same flat sequence of transformers regardless of how the ``>>``
+    operations are associated.
     """
 
-    #: The first transformer in the chain.
-    first: SerialTransformer[T_SourceProduct_arg, T_SourceProduct_ret]
+    #: The transformers in the chain, in the order in which they are applied.
+    transformers: tuple[SerialTransformer[Any, Any], ...]
 
-    #: The second transformer in the chain.
-    second: SerialTransformer[T_SourceProduct_ret, T_TransformedProduct_ret]
+    #: The chain of all transformers but the last, created on demand.
+    _source: SerialTransformer[T_SourceProduct_arg, T_SourceProduct_ret] | None = None
 
-    def __init__(
-        self,
-        first: SerialTransformer[T_SourceProduct_arg, T_SourceProduct_ret],
-        second: SerialTransformer[T_SourceProduct_ret, T_TransformedProduct_ret],
-    ) -> None:
+    def __init__(self, *transformers: SerialTransformer[Any, Any]) -> None:
         """
-        :param first: the first transformer in the chain
-        :param second: the second transformer in the chain
+        :param transformers: the transformers to chain, in the order in which they are
+            applied; nested chained transformers are flattened
+        :raises ValueError: if fewer than two transformers are given
         """
         super().__init__()
-        self.first = first
-        self.second = second
+        self.transformers = _flatten_chained_transformers(transformers)
+        if len(self.transformers) < 2:
+            raise ValueError(
+                "A chained transformer requires at least two transformers, but got: "
+                + ", ".join(map(str, self.transformers))
+            )
+        if len(transformers) == 2 and isinstance(transformers[0], _ChainedTransformer):
+            # The first transformer is the chain of all transformers but the last,
+            # so we can reuse it as the source of this chain
+            self._source = transformers[0]
 
     @property
     def input_type(self) -> type[T_SourceProduct_arg]:
         """[see superclass]"""
-        return self.first.input_type
+        return self.transformers[0].input_type
 
     @property
     def product_type(self) -> type[T_TransformedProduct_ret]:
         """[see superclass]"""
-        return self.second.product_type
+        return self.transformers[-1].product_type
 
     @property
     def source(self) -> SerialTransformer[T_SourceProduct_arg, T_SourceProduct_ret]:
         """[see superclass]"""
-        return self.first
+        source = self._source
+        if source is None:
+            transformers = self.transformers
+            self._source = source = (
+                transformers[0]
+                if len(transformers) == 2
+                else _chain_transformers(*transformers[:-1])
+            )
+        return source
 
     @property
     def processor(
         self,
     ) -> SerialTransformer[T_SourceProduct_ret, T_TransformedProduct_ret]:
         """[see superclass]"""
-        return self.second
+        return self.transformers[-1]
+
+    def _iter_stages(self) -> Iterator[SerialTransformer[Any, Any]]:
+        """[see superclass]"""
+        return iter(self.transformers)
+
+    def _iter_connections(
+        self, *, ingoing: Collection[SerialConduit[Any]]
+    ) -> Iterator[tuple[SerialConduit[Any], SerialConduit[Any]]]:
+        """[see superclass]"""
+        # Serial transformers never include a pass-through, so the ingoing conduits of
+        # each transformer are the final conduits of its predecessor
+        for transformer in self.transformers:
+            yield from transformer.get_connections(ingoing=ingoing)
+            ingoing = _get_final_conduits_tuple(transformer)
+
+    def process(
+        self, input: Iterable[T_SourceProduct_arg]
+    ) -> Iterator[T_TransformedProduct_ret]:
+        """[see superclass]"""
+        products: Iterable[Any] = input
+        for transformer in self.transformers:
+            products = transformer.process(products)
+        return iter(products)
+
+    def aprocess(
+        self, input: AsyncIterable[T_SourceProduct_arg]
+    ) -> AsyncIterator[T_TransformedProduct_ret]:
+        """[see superclass]"""
+        products: AsyncIterable[Any] = input
+        for transformer in self.transformers:
+            products = transformer.aprocess(products)
+        return aiter(products)
 
     def transform(
         self, source_product: T_SourceProduct_arg
     ) -> Iterator[T_TransformedProduct_ret]:
         """[see superclass]"""
-        for tx_first in self.first.transform(source_product):
-            yield from self.second.transform(tx_first)
+        return self.process((source_product,))
 
     def atransform(
         self, source_product: T_SourceProduct_arg
     ) -> AsyncIterator[T_TransformedProduct_ret]:
         """[see superclass]"""
+        return self.aprocess(iter_sync_to_async((source_product,)))
 
-        # noinspection PyTypeChecker
-        return async_flatten(
-            self.second.atransform(tx_first)
-            async for tx_first in self.first.atransform(source_product)
+
+@final
+@inheritdoc(match="[see superclass]")
+class _FusedSerialTransformer(
+    _ChainedTransformer[
+        T_SourceProduct_arg, T_SourceProduct_ret, T_TransformedProduct_ret
+    ],
+    Generic[T_SourceProduct_arg, T_SourceProduct_ret, T_TransformedProduct_ret],
+):
+    """
+    A sequential composition of two or more serial transformers, where the transform
+    methods of all transformers in the chain are fused into a single generator.
+
+    Transforming a product with a chain of `n` transformers then requires a single
+    generator frame with `n` nested loops, instead of `n` generator frames nested
+    inside each other.
+
+    Only transformers that do not override :meth:`.SerialTransformer.process` can be
+    fused, since fusion bypasses the ``process`` methods of the fused transformers.
+
+    If any of the fused transformers implements
+    :meth:`.SerialTransformer.transform_batch`, products are processed in batches
+    instead. Each batch is handed over from one transformer to the next as-is, unless
+    it exceeds the batch size of the next transformer, in which case it is sliced.
+    """
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """
+        Pickle this chain as the transformers it is composed of.
+
+        :return: the callable and arguments to re-create this chain
+        """
+        # The fused functions are generated closures that cannot be pickled, so we
+        # pickle the fused transformers instead, and fuse them again when unpickled
+        return _FusedSerialTransformer, self.transformers
+
+    @functools.cached_property
+    def _fused_functions(
+        self,
+    ) -> tuple[
+        Callable[[Any], Iterator[Any]], Callable[[Iterable[Any]], Iterator[Any]]
+    ]:
+        """
+        The fused transform and process functions of this chain.
+
+        Generated upon first use, so that composing a long chain one transformer at
+        a time does not fuse each of the intermediate chains.
+        """
+        single_yield = tuple(
+            transformer._single_yield for transformer in self.transformers
+        )
+        stages = tuple(
+            transformer._transform_one if single else transformer.transform
+            for transformer, single in zip(self.transformers, single_yield)
+        )
+        return _fuse_stages(stages, single_yield)
+
+    @functools.cached_property
+    def _is_batched(self) -> bool:
+        """
+        ``True`` if any of the transformers in this chain implements
+        :meth:`.SerialTransformer.transform_batch`, so that products are processed in
+        batches; ``False`` if products are processed one by one.
+        """
+        return any(
+            type(transformer).transform_batch is not SerialTransformer.transform_batch
+            for transformer in self.transformers
         )
 
+    def process(
+        self, input: Iterable[T_SourceProduct_arg]
+    ) -> Iterator[T_TransformedProduct_ret]:
+        """[see superclass]"""
+        if self._is_batched:
+            return itertools.chain.from_iterable(
+                self._transform_batches(
+                    _iter_batches(input, self.transformers[0].batch_size)
+                )
+            )
+        else:
+            # Iterate over the input and apply all stages in a single frame
+            return self._fused_functions[1](input)
+
+    def transform(
+        self, source_product: T_SourceProduct_arg
+    ) -> Iterator[T_TransformedProduct_ret]:
+        """[see superclass]"""
+        return self._fused_functions[0](source_product)
+
+    def transform_batch(
+        self, source_products: Collection[T_SourceProduct_arg]
+    ) -> Collection[T_TransformedProduct_ret]:
+        """[see superclass]"""
+        batches = list(self._transform_batches((source_products,)))
+        if len(batches) == 1:
+            return batches[0]
+        return [product for batch in batches for product in batch]
+
+    def _transform_batches(
+        self, batches: Iterable[Collection[Any]]
+    ) -> Iterator[Collection[Any]]:
+        """
+        Apply the batch transforms of all transformers in this chain to the given
+        batches.
+
+        Before each transformer, the batches are split to at most the batch size of
+        that transformer.
+
+        :param batches: the batches to transform
+        :return: an iterator over the transformed batches
+        """
+        for transformer in self.transformers:
+            batches = _iter_transformed_batches(transformer, batches)
+        return iter(batches)
+
 
 @inheritdoc(match="[see superclass]")
 class _ChainedConcurrentProducer(
@@ -398,3 +596,196 @@ class _ChainedConcurrentTransformer(
         """[see superclass]"""
         for producer in self.first.iter_concurrent_producers(source=source):
             yield from self.second.iter_concurrent_producers(source=producer)
+
+
+#
+# Auxiliary functions
+#
+
+
+def _chain_transformers(
+    *transformers: SerialTransformer[Any, Any]
+) -> SerialTransformer[Any, Any]:
+    """
+    Chain the given serial transformers, fusing them if possible.
+
+    Identity transformers are dropped from the chain, unless all transformers are
+    identities.
+
+    :param transformers: the transformers to chain, in the order in which they are
+        applied
+    :return: the chained transformer, or the only transformer left after dropping
+        identity transformers
+    """
+    # Chained transformers never include identity transformers, so it is sufficient
+    # to check the given transformers without flattening them
+    if any(transformer._is_identity for transformer in transformers):
+        transformers = tuple(
+            transformer for transformer in transformers if not transformer._is_identity
+        ) or (transformers[0],)
+        if len(transformers) == 1:
+            return transformers[0]
+
+    # Fused transformers only include transformers that can be fused
+    if all(
+        type(transformer).process is SerialTransformer.process
+        or isinstance(transformer, _FusedSerialTransformer)
+        for transformer in transformers
+    ):
+        return _FusedSerialTransformer(*transformers)
+    else:
+        return _ChainedTransformer(*transformers)
+
+
+def _flatten_chained_transformers(
+    transformers: Iterable[SerialTransformer[Any, Any]]
+) -> tuple[SerialTransformer[Any, Any], ...]:
+    """
+    Flatten the given transformers, replacing chained transformers with the
+    transformers they are composed of.
+
+    :param transformers: the transformers to flatten
+    :return: the flattened transformers
+    """
+    return tuple(
+        itertools.chain.from_iterable(
+            (
+                transformer.transformers
+                if isinstance(transformer, _ChainedTransformer)
+                else (transformer,)
+            )
+            for transformer in transformers
+        )
+    )
+
+
+def _iter_transformed_batches(
+    transformer: SerialTransformer[Any, Any], batches: Iterable[Collection[Any]]
+) -> Iterator[Collection[Any]]:
+    """
+    Apply the batch transform of the given transformer to the given batches, after
+    splitting them to at most the batch size of the transformer.
+
+    :param transformer: the transformer to apply
+    :param batches: the batches to transform
+    :return: an iterator over the transformed batches
+    """
+    # We call the batch transform in a generator frame rather than using map, so that
+    # a StopIteration raised by the batch transform is not mistaken for the end of
+    # the batches
+    transform_batch = transformer.transform_batch
+    for batch in _split_batches(batches, transformer.batch_size):
+        yield transform_batch(batch)
+
+
+def _fuse_stages(
+    stages: Sequence[Callable[[Any], Any]], single_yield: Sequence[bool]
+) -> tuple[Callable[[Any], Iterator[Any]], Callable[[Iterable[Any]], Iterator[Any]]]:
+    """
+    Fuse the given transform stages into a transform generator function applying all
+    stages to a single product, and a process generator function applying all stages
+    to each product of an iterable.
+
+    Chains with more than :data:`_MAX_FUSED_STAGES` stages are fused in blocks of
+    consecutive stages, which are then fused in turn.
+
+    :param stages: the transform stages to fuse
+    :param single_yield: for each stage, ``True`` if it returns a single product
+        instead of an iterable of products
+    :return: the fused transform and process functions
+    """
+    while len(stages) > _MAX_FUSED_STAGES:
+        blocks = [
+            (stages[i : i + _MAX_FUSED_STAGES], single_yield[i : i + _MAX_FUSED_STAGES])
+            for i in range(0, len(stages), _MAX_FUSED_STAGES)
+        ]
+        stages = [
+            (
+                block_stages[0]
+                if len(block_stages) == 1
+                else _get_fused_factory(tuple(block_single_yield))(*block_stages)[0]
+            )
+            for block_stages, block_single_yield in blocks
+        ]
+        single_yield = [
+            len(block_stages) == 1 and block_single_yield[0]
+            for block_stages, block_single_yield in blocks
+        ]
+    return _get_fused_factory(tuple(single_yield))(*stages)
+
+
+def _get_fused_factory(single_yield: tuple[bool, ...]) -> Callable[
+    ...,
+    tuple[Callable[[Any], Iterator[Any]], Callable[[Iterable[Any]], Iterator[Any]]],
+]:
+    """
+    Get a factory function that takes transform stages as arguments, and returns the
+    fused transform and process generator functions for these stages.
+
+    The factory is generated and compiled upon first use for any given shape of
+    stages, and then cached.
+
+    :param single_yield: for each stage, ``True`` if it returns a single product
+        instead of an iterable of products
+    :return: the factory function
+    """
+    try:
+        return _FUSED_CODE_CACHE[single_yield]
+    except KeyError:
+        pass
+
+    n = len(single_yield)
+
+    # Generate the source code for a factory function that takes the stages as
+    # arguments and returns the fused generator functions as closures, e.g.,
+    # for three stages where the second stage is single-yield:
+    #
+    # def _make_fused(s0, s1, s2):
+    #     def transform(source_product):
+    #         for v0 in s0(source_product):
+    #             v1 = s1(v0)
+    #             yield from s2(v1)
+    #     def process(input):
+    #         for source_product in input:
+    #             for v0 in s0(source_product):
+    #                 v1 = s1(v0)
+    #                 yield from s2(v1)
+    #     return transform, process
+
+    def _body(indent: str) -> Iterator[str]:
+        # Generate the nested loops applying all stages to the source product
+        arg = "source_product"
+        for i in range(n - 1):
+            if single_yield[i]:
+                yield f"{indent}v{i} = s{i}({arg})"
+            else:
+                yield f"{indent}for v{i} in s{i}({arg}):"
+                indent += "    "
+            arg = f"v{i}"
+        if single_yield[n - 1]:
+            yield f"{indent}yield s{n - 1}({arg})"
+        else:
+            yield f"{indent}yield from s{n - 1}({arg})"
+
+    lines = [
+        f"def _make_fused({', '.join(f's{i}' for i in range(n))}):",
+        "    def transform(source_product):",
+        *_body(" " * 8),
+        "    def process(input):",
+        "        for source_product in input:",
+        *_body(" " * 12),
+        "    return transform, process",
+    ]
+
+    namespace: dict[str, Any] = {}
+    exec(compile("\n".join(lines), "<fused transform>", "exec"), namespace)
+    factory = _FUSED_CODE_CACHE[single_yield] = namespace["_make_fused"]
+    return cast(
+        Callable[
+            ...,
+            tuple[
+                Callable[[Any], Iterator[Any]], Callable[[Iterable[Any]], Iterator[Any]]
+            ],
+        ],
+        factory,
+    )
@@ -165,7 +165,7 @@ class SimpleConcurrentTransformer(
         for transformer in self.transformers:
             yield from transformer.get_final_conduits()
 
-    @property
+    @functools.cached_property
     def _has_passthrough(self) -> bool:
         """[see superclass]"""
         return any(transformer._has_passthrough for transformer in self.transformers)
@@ -20,10 +20,20 @@ Implementation of conduit base classes.
 
 from __future__ import annotations
 
+import functools
+import itertools
 import logging
 from abc import ABCMeta, abstractmethod
-from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
-from typing import Any, Generic, TypeVar, final, overload
+from collections.abc import (
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Collection,
+    Iterable,
+    Iterator,
+    Sequence,
+)
+from typing import Any, ClassVar, Generic, TypeVar, cast, final, overload
 
 from typing_extensions import Self
 
@@ -37,7 +47,9 @@ from pytools.typing import (
 
 from ..._passthrough import Passthrough
 from .. import ConcurrentConduit, Processor, SerialProcessor, SerialSource, Source
-from ..producer import BaseProducer, SerialProducer
+from .._base import _get_simple_module
+from ..producer import BaseProducer, ConcurrentProducer, SerialProducer
+from ..producer._producer_base import _aproduce
 
 log = logging.getLogger(__name__)
 
@@ -55,11 +67,23 @@ __all__ = [
 # _arg for contravariant type variables used in argument positions
 #
 
+T = TypeVar("T")
 T_SourceProduct_arg = TypeVar("T_SourceProduct_arg", contravariant=True)
 T_Product_ret = TypeVar("T_Product_ret", covariant=True)
 T_TransformedProduct_ret = TypeVar("T_TransformedProduct_ret", covariant=True)
 
 
+#
+# Constants
+#
+
+#: Rules for composing transformers with producers, passthroughs, and other
+#: transformers, mapping the kind of the left operand, the operator, and the kind of
+#: the right operand to a function creating the composite conduit; populated upon
+#: first use to avoid circular imports.
+_COMPOSE_RULES: dict[tuple[str | None, str, str | None], Callable[[Any, Any], Any]] = {}
+
+
 #
 # Classes
 #
@@ -76,6 +100,14 @@ class BaseTransformer(
     :class:`.SerialTransformer` or a :class:`.ConcurrentTransformer`.
     """
 
+    #: The kind of this transformer, used to look up the rules for composing it with
+    #: other conduits.
+    _kind: ClassVar[str]
+
+    #: ``True`` if this transformer has been validated for use as a concurrent
+    #: conduit with a passthrough; set on the instance upon successful validation.
+    _passthrough_validated: bool = False
+
     @abstractmethod
     def iter_concurrent_producers(
         self, *, source: SerialProducer[T_SourceProduct_arg]
@@ -94,41 +126,14 @@ class BaseTransformer(
             BaseTransformer[T_SourceProduct_arg, T_TransformedProduct_ret] | Passthrough
         ),
     ) -> BaseTransformer[T_SourceProduct_arg, T_TransformedProduct_ret]:
-        input_type: type[T_SourceProduct_arg]
-        product_type: type[T_TransformedProduct_ret]
-
-        if isinstance(other, Passthrough):
-            _validate_concurrent_passthrough(self)
-            input_type = self.input_type
-            product_type = self.product_type
-        elif not isinstance(other, BaseTransformer):
-            return NotImplemented
-        else:
-            input_type = get_common_generic_subclass(
-                (self.input_type, other.input_type)
-            )
-            product_type = get_common_generic_base(
-                (self.product_type, other.product_type)
-            )
-        from . import SimpleConcurrentTransformer
-
-        return SimpleConcurrentTransformer[
-            input_type, product_type  # type: ignore[valid-type]
-        ](self, other)
+        rule = _get_compose_rule(self, "&", other)
+        return NotImplemented if rule is None else rule(self, other)
 
     def __rand__(
         self, other: Passthrough
     ) -> BaseTransformer[T_SourceProduct_arg, T_TransformedProduct_ret]:
-        if isinstance(other, Passthrough):
-            _validate_concurrent_passthrough(self)
-
-            from . import SimpleConcurrentTransformer
-
-            return SimpleConcurrentTransformer[
-                self.input_type, self.product_type  # type: ignore[name-defined]
-            ](other, self)
-        else:
-            return NotImplemented
+        rule = _get_compose_rule(other, "&", self)
+        return NotImplemented if rule is None else rule(other, self)
 
     @overload
     def __rshift__(
@@ -157,12 +162,8 @@ class BaseTransformer(
         BaseTransformer[T_SourceProduct_arg, T_Product_ret]
         | SerialTransformer[T_SourceProduct_arg, T_Product_ret]
     ):
-        if isinstance(other, BaseTransformer):
-            from ._chained_ import _ChainedConcurrentTransformer
-
-            return _ChainedConcurrentTransformer(self, other)
-        else:
-            return NotImplemented
+        rule = _get_compose_rule(self, ">>", other)
+        return NotImplemented if rule is None else rule(self, other)
 
     @overload
     def __rrshift__(
@@ -183,17 +184,8 @@ class BaseTransformer(
         self,
         other: BaseProducer[T_SourceProduct_arg],
     ) -> BaseProducer[T_TransformedProduct_ret] | Self:
-        if isinstance(other, SerialProducer):
-            from ._chained_ import _ChainedConcurrentTransformedProducer
-
-            # noinspection PyTypeChecker
-            return _ChainedConcurrentTransformedProducer(source=other, transformer=self)
-        elif isinstance(other, BaseProducer):
-            from ._chained_ import _ChainedConcurrentProducer
-
-            return _ChainedConcurrentProducer(source=other, transformer=self)
-        else:
-            return NotImplemented
+        rule = _get_compose_rule(other, ">>", self)
+        return NotImplemented if rule is None else rule(other, self)
 
 
 @inheritdoc(match="[see superclass]")
@@ -206,8 +198,24 @@ class SerialTransformer(
 ):
     """
     A transformer that generates new products from the products of a producer.
+
+    Subclasses that can transform many products more efficiently at once than one
+    by one may override :meth:`.transform_batch`; :meth:`.process` will then pass
+    the input products to :meth:`.transform_batch` in batches of up to
+    :attr:`.batch_size` products.
     """
 
+    _kind = "serial_transformer"
+
+    #: The maximum number of products passed to :meth:`.transform_batch` at once.
+    batch_size: int = 64
+
+    #: ``True`` if :meth:`.transform` generates exactly one product per source
+    #: product; subclasses setting this to ``True`` should implement
+    #: :meth:`._transform_one`, which is then used in place of :meth:`.transform` to
+    #: process products.
+    _single_yield: bool = False
+
     @final
     def iter_concurrent_producers(
         self, *, source: SerialProducer[T_SourceProduct_arg]
@@ -219,13 +227,30 @@ class SerialTransformer(
         self, input: Iterable[T_SourceProduct_arg]
     ) -> Iterator[T_TransformedProduct_ret]:
         """[see superclass]"""
-        for product in input:
-            yield from self.transform(product)
+        # We iterate in a generator frame rather than using map or itertools, so that
+        # a StopIteration raised by a transform method is not mistaken for the end of
+        # the input
+        if type(self).transform_batch is not SerialTransformer.transform_batch:
+            transform_batch = self.transform_batch
+            for batch in _iter_batches(input, self.batch_size):
+                yield from transform_batch(batch)
+        elif self._single_yield:
+            transform_one = self._transform_one
+            for product in input:
+                yield transform_one(product)
+        else:
+            transform = self.transform
+            for product in input:
+                yield from transform(product)
 
     def aprocess(
         self, input: AsyncIterable[T_SourceProduct_arg]
     ) -> AsyncIterator[T_TransformedProduct_ret]:
         """[see superclass]"""
+        if type(self).atransform is SerialTransformer.atransform:
+            # The default atransform method defers to the synchronous transform
+            # method, so we can transform all products in a single async generator
+            return _atransform_sync(self.transform, input)
         # noinspection PyTypeChecker
         return async_flatten(self.atransform(product) async for product in input)
 
@@ -254,6 +279,60 @@ class SerialTransformer(
         for tx in self.transform(source_product):
             yield tx
 
+    def _transform_one(
+        self, source_product: T_SourceProduct_arg
+    ) -> T_TransformedProduct_ret:
+        """
+        Generate exactly one new product from an existing product.
+
+        Only used if :attr:`._single_yield` is ``True``. By default, returns the only
+        product generated by :meth:`.transform`.
+
+        :param source_product: an existing product to use as input
+        :return: the new product
+        :raises ValueError: if :meth:`.transform` does not generate exactly one
+            product
+        """
+        products = list(itertools.islice(self.transform(source_product), 2))
+        if len(products) != 1:
+            raise ValueError(
+                f"Single-yield transformer {type(self).__name__} must generate exactly "
+                f"one product, but generated {len(products) or 'no'}"
+                f"{' or more' if len(products) > 1 else ''} products for source "
+                f"product: {source_product!r}"
+            )
+        return products[0]
+
+    def transform_batch(
+        self, source_products: Collection[T_SourceProduct_arg]
+    ) -> Collection[T_TransformedProduct_ret]:
+        """
+        Generate new products from a batch of existing products.
+
+        By default, defers to :meth:`.transform` for each product in the batch.
+
+        Implementations may return any sliceable collection, including vectorized
+        representations such as NumPy arrays. Within a chain of transformers, the
+        returned collection is passed on as-is to the batch transform of the next
+        transformer, or in slices if it exceeds the batch size of the next
+        transformer.
+
+        Note that the elements of the returned collection become the new products,
+        regardless of the declared :attr:`.product_type`; e.g., the elements of a
+        NumPy array of integers are NumPy scalars such as :class:`numpy.int64`, not
+        Python :class:`int` objects.
+
+        :param source_products: the existing products to use as input
+        :return: the new products
+        """
+        if self._single_yield:
+            transform_one = self._transform_one
+            return [transform_one(source_product) for source_product in source_products]
+        transform = self.transform
+        return [
+            tx for source_product in source_products for tx in transform(source_product)
+        ]
+
     @overload
     def __rshift__(
         self,
@@ -280,13 +359,8 @@ class SerialTransformer(
     ):
         # Create a combined transformer where the output of this transformer is used as
         # the input of the other transformer
-        if isinstance(other, SerialTransformer):
-            # We import locally to avoid circular imports
-            from ._chained_ import _ChainedTransformer
-
-            return _ChainedTransformer(self, other)
-
-        return super().__rshift__(other)
+        rule = _get_compose_rule(self, ">>", other)
+        return NotImplemented if rule is None else rule(self, other)
 
     @overload
     def __rrshift__(
@@ -303,13 +377,8 @@ class SerialTransformer(
     def __rrshift__(
         self, other: BaseProducer[T_SourceProduct_arg]
     ) -> BaseProducer[T_TransformedProduct_ret]:
-        if isinstance(other, SerialProducer):
-            # We import locally to avoid circular imports
-            from ._chained_ import _ChainedProducer
-
-            return _ChainedProducer(producer=other, transformer=self)
-        else:
-            return super().__rrshift__(other)
+        rule = _get_compose_rule(other, ">>", self)
+        return NotImplemented if rule is None else rule(other, self)
 
 
 #
@@ -317,6 +386,206 @@ class SerialTransformer(
 #
 
 
+async def _atransform_sync(
+    transform: Callable[[T_SourceProduct_arg], Iterable[T_TransformedProduct_ret]],
+    input: AsyncIterable[T_SourceProduct_arg],
+) -> AsyncIterator[T_TransformedProduct_ret]:
+    """
+    Transform products from an async iterable using a synchronous transform function.
+
+    :param transform: the synchronous transform function
+    :param input: the products to transform
+    :return: an async iterator of the transformed products
+    """
+    async for product in input:
+        for tx in transform(product):
+            yield tx
+
+
+def _get_compose_rule(
+    lhs: Any, operator: str, rhs: Any
+) -> Callable[[Any, Any], Any] | None:
+    """
+    Look up the rule for composing the given operands, at least one of which is a
+    transformer.
+
+    :param lhs: the operand on the left of the operator
+    :param operator: the operator, either ``"&"`` or ``">>"``
+    :param rhs: the operand on the right of the operator
+    :return: the function creating the composite conduit, or ``None`` if the operands
+        cannot be composed using the given operator
+    """
+    if not _COMPOSE_RULES:
+        _COMPOSE_RULES.update(_make_compose_rules())
+    return _COMPOSE_RULES.get(
+        (getattr(type(lhs), "_kind", None), operator, getattr(type(rhs), "_kind", None))
+    )
+
+
+def _make_compose_rules() -> (
+    dict[tuple[str | None, str, str | None], Callable[[Any, Any], Any]]
+):
+    """
+    Create the rules for composing transformers with producers, passthroughs, and
+    other transformers.
+
+    :return: the composition rules
+    """
+    # We import locally to avoid circular imports
+    from ._chained_ import (
+        _ChainedConcurrentProducer,
+        _ChainedConcurrentTransformedProducer,
+        _ChainedConcurrentTransformer,
+        _ChainedProducer,
+        _chain_transformers,
+    )
+    from ._simple import SimpleConcurrentTransformer
+
+    def _chain_concurrent(
+        first: BaseTransformer[Any, Any], second: BaseTransformer[Any, Any]
+    ) -> BaseTransformer[Any, Any]:
+        # Identity transformers do not alter the products, so we can drop them
+        if second._is_identity:
+            return first
+        elif first._is_identity:
+            return second
+        return _ChainedConcurrentTransformer(first, second)
+
+    def _group(
+        first: BaseTransformer[Any, Any], second: BaseTransformer[Any, Any]
+    ) -> BaseTransformer[Any, Any]:
+        types: tuple[Any, ...] = (
+            first.input_type,
+            first.product_type,
+            second.input_type,
+            second.product_type,
+        )
+        input_type, product_type = _get_group_types(*types)
+        return SimpleConcurrentTransformer[
+            input_type, product_type  # type: ignore[valid-type]
+        ](first, second)
+
+    def _group_with_passthrough(
+        transformer: BaseTransformer[Any, Any],
+        *transformers: BaseTransformer[Any, Any] | Passthrough,
+    ) -> BaseTransformer[Any, Any]:
+        _validate_concurrent_passthrough(transformer)
+        return SimpleConcurrentTransformer[
+            transformer.input_type, transformer.product_type  # type: ignore[name-defined]
+        ](*transformers)
+
+    transformer_kinds = ("serial_transformer", "concurrent_transformer")
+    rules: dict[tuple[str | None, str, str | None], Callable[[Any, Any], Any]] = {}
+    for lhs in transformer_kinds:
+        for rhs in transformer_kinds:
+            rules[lhs, ">>", rhs] = (
+                _chain_transformers
+                if lhs == rhs == "serial_transformer"
+                else _chain_concurrent
+            )
+            rules[lhs, "&", rhs] = _group
+        rules[lhs, "&", "passthrough"] = lambda transformer, passthrough: (
+            _group_with_passthrough(transformer, transformer, passthrough)
+        )
+        rules["passthrough", "&", lhs] = lambda passthrough, transformer: (
+            _group_with_passthrough(transformer, passthrough, transformer)
+        )
+
+    rules["serial_producer", ">>", "serial_transformer"] = (
+        lambda producer, transformer: (
+            _ChainedProducer(producer=producer, transformer=transformer)
+        )
+    )
+    rules["serial_producer", ">>", "concurrent_transformer"] = (
+        lambda source, transformer: (
+            _ChainedConcurrentTransformedProducer(
+                source=source, transformer=transformer
+            )
+        )
+    )
+    for rhs in transformer_kinds:
+        rules["concurrent_producer", ">>", rhs] = lambda source, transformer: (
+            _ChainedConcurrentProducer(source=source, transformer=transformer)
+        )
+    return rules
+
+
+def _iter_batches(iterable: Iterable[T], batch_size: int) -> Iterator[list[T]]:
+    """
+    Split the given iterable into consecutive batches.
+
+    :param iterable: the iterable to split into batches
+    :param batch_size: the maximum number of items per batch
+    :return: an iterator over the batches
+    """
+    iterator = iter(iterable)
+    while batch := list(itertools.islice(iterator, batch_size)):
+        yield batch
+
+
+def _split_batches(
+    batches: Iterable[Collection[T]], batch_size: int
+) -> Iterator[Collection[T]]:
+    """
+    Split the given batches into batches of at most the given size, skipping empty
+    batches.
+
+    Batches within the size limit are passed on as-is, and larger batches are
+    sliced, so that vectorized representations such as NumPy arrays are preserved.
+
+    :param batches: the batches to split; batches exceeding the size limit must
+        support slicing
+    :param batch_size: the maximum number of items per batch
+    :return: an iterator over the split batches
+    """
+    for batch in batches:
+        n = len(batch)
+        if n > batch_size:
+            for start in range(0, n, batch_size):
+                yield cast(Sequence[T], batch)[start : start + batch_size]
+        elif n:
+            yield batch
+
+
+@functools.lru_cache(maxsize=1024)
+def _get_group_types(
+    first_input_type: Any,
+    first_product_type: Any,
+    second_input_type: Any,
+    second_product_type: Any,
+) -> tuple[Any, Any]:
+    """
+    Get the input and product types of a group of two transformers, caching the
+    results as groups are typically built repeatedly from transformers of the same
+    types.
+
+    :param first_input_type: the input type of the first transformer
+    :param first_product_type: the product type of the first transformer
+    :param second_input_type: the input type of the second transformer
+    :param second_product_type: the product type of the second transformer
+    :return: the common input subtype and the common product base type of the
+        transformers
+    """
+    return (
+        get_common_generic_subclass((first_input_type, second_input_type)),
+        get_common_generic_base((first_product_type, second_product_type)),
+    )
+
+
+@functools.lru_cache(maxsize=4096)
+def _issubclass_generic_cached(subclass: Any, base: Any) -> bool:
+    """
+    Check if the given type is a generic subclass of the given base type, caching
+    the results as types of conduits are typically checked repeatedly.
+
+    :param subclass: the type to check
+    :param base: the base type to check against
+    :return: ``True`` if the type is a generic subclass of the base type, ``False``
+        otherwise
+    """
+    return issubclass_generic(subclass, base)
+
+
 def _validate_concurrent_passthrough(
     conduit: BaseTransformer[Any, Any] | Passthrough
 ) -> None:
@@ -328,15 +597,19 @@ def _validate_concurrent_passthrough(
     :param conduit: the conduit to validate
     """
 
-    if not (
-        isinstance(conduit, Passthrough)
-        or (issubclass_generic(conduit.input_type, conduit.product_type))
+    if isinstance(conduit, Passthrough) or conduit._passthrough_validated:
+        return
+    if not _issubclass_generic_cached(
+        conduit.input_type, conduit.product_type  # type: ignore[arg-type]
     ):
         raise TypeError(
             "Conduit is not a valid concurrent conduit with a passthrough because its "
             f"input type {conduit.input_type} is not a subtype of its product type "
             f"{conduit.product_type}:\n{conduit}"
         )
+    # Conduits are immutable once composed, so each conduit needs to be validated
+    # only once
+    conduit._passthrough_validated = True
 
 
 class ConcurrentTransformer(
@@ -349,6 +622,15 @@ class ConcurrentTransformer(
     A collection of one or more transformers, operating in parallel.
     """
 
+    _kind = "concurrent_transformer"
+
+    #: The maximum number of products buffered by :meth:`.aprocess`.
+    buffer_size: int = ConcurrentProducer.buffer_size
+
+    #: The maximum number of concurrent producers running at the same time in
+    #: :meth:`.aprocess`; ``None`` to run all concurrent producers at the same time.
+    num_workers: int | None = ConcurrentProducer.num_workers
+
     def process(
         self, input: Iterable[T_SourceProduct_arg]
     ) -> Iterator[T_TransformedProduct_ret]:
@@ -358,11 +640,11 @@ class ConcurrentTransformer(
         :param input: the products to transform
         :return: the transformed products
         """
-        from ...simple import SimpleProducer
-
-        return iter(
-            SimpleProducer[self.input_type](input) >> self  # type: ignore[name-defined]
-        )
+        source = _get_simple_module().SimpleProducer[self.input_type](input)
+        # We run the concurrent producers directly, rather than chaining this
+        # transformer with the source
+        for producer in self.iter_concurrent_producers(source=source):
+            yield from producer
 
     def aprocess(
         self, input: AsyncIterable[T_SourceProduct_arg]
@@ -373,9 +655,11 @@ class ConcurrentTransformer(
         :param input: the products to transform
         :return: the transformed products
         """
-        from ...simple import SimpleAsyncProducer
-
-        return aiter(
-            SimpleAsyncProducer[self.input_type](input)  # type: ignore[name-defined]
-            >> self
+        source = _get_simple_module().SimpleAsyncProducer[self.input_type](input)
+        # We run the concurrent producers directly, rather than chaining this
+        # transformer with the source
+        return _aproduce(
+            tuple(self.iter_concurrent_producers(source=source)),
+            buffer_size=self.buffer_size,
+            num_workers=self.num_workers,
         )
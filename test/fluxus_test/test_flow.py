@@ -1,21 +1,47 @@
 import asyncio
 import logging
+import pickle
 import re
+import sys
 from abc import ABCMeta
 from collections import defaultdict
-from collections.abc import AsyncIterable, Iterable, Iterator
+from collections.abc import (
+    AsyncGenerator,
+    AsyncIterable,
+    AsyncIterator,
+    Collection,
+    Iterable,
+    Iterator,
+)
+from dataclasses import dataclass
 from io import StringIO
 from typing import Any, cast
 
 import pytest
 
-from fluxus import AsyncConsumer, Consumer, Flow, Passthrough, Producer, Transformer
+from fluxus import (
+    AsyncConsumer,
+    AsyncProducer,
+    Consumer,
+    Flow,
+    Passthrough,
+    Producer,
+    Transformer,
+)
 from fluxus.core import Conduit
-from fluxus.core.producer import ConcurrentProducer
-from fluxus.core.transformer import BaseTransformer, ConcurrentTransformer
+from fluxus.core.producer import (
+    ConcurrentProducer,
+    SerialProducer,
+    SimpleConcurrentProducer,
+)
+from fluxus.core.transformer import (
+    BaseTransformer,
+    ConcurrentTransformer,
+    SerialTransformer,
+)
 from fluxus.functional import parallel
 from fluxus.viz import FlowGraph, FlowGraphStyle, FlowTextStyle
-from pytools.expression import freeze
+from pytools.expression import Expression, freeze
 from pytools.expression.atomic import Id
 from pytools.viz.color import RgbColor
 
@@ -561,3 +587,449 @@ def test_large_flows() -> None:
     parallel_producer = parallel(*[NumberProducer(0, i + 1) for i in range(1000)])
 
     assert parallel_producer.n_concurrent_conduits == 1000
+
+
+def test_fused_transformers() -> None:
+    """
+    Test that chained serial transformers are fused into a single transformer.
+    """
+
+    # noinspection PyProtectedMember
+    from fluxus.core.transformer._chained_ import _FusedSerialTransformer
+
+    transformer = (
+        DoublingTransformer() >> IncrementingTransformer() >> DoublingTransformer()
+    )
+    assert isinstance(transformer, _FusedSerialTransformer)
+    assert len(transformer.transformers) == 3
+    assert tuple(type(conduit) for conduit in transformer.chained_conduits) == (
+        DoublingTransformer,
+        IncrementingTransformer,
+        DoublingTransformer,
+    )
+
+    expected_result = [1, 2, 1, 2]
+    assert list(transformer.transform(0)) == expected_result
+    assert list(transformer.process([0])) == expected_result
+
+    # Fused chains can be pickled, even though their fused functions cannot
+    unpickled = pickle.loads(pickle.dumps(transformer))
+    assert isinstance(unpickled, _FusedSerialTransformer)
+    assert list(unpickled.process([0])) == expected_result
+
+    flow = NumberProducer(0, 1) >> transformer >> NumberConsumer()
+    assert flow.run() == [expected_result]
+    assert asyncio.run(flow.arun()) == [expected_result]
+
+    # chains exceeding the nesting limit for Python code are fused in blocks
+    transformer = DoublingTransformer()
+    for _ in range(40):
+        transformer = transformer >> IncrementingTransformer()
+    assert isinstance(transformer, _FusedSerialTransformer)
+    assert list(transformer.process([0, 1])) == [40, 40, 41, 42]
+
+
+def test_chain_associativity() -> None:
+    """
+    Test that chained transformers are flattened regardless of associativity.
+    """
+
+    # noinspection PyProtectedMember
+    from fluxus.core.transformer._chained_ import (
+        _ChainedTransformer,
+        _FusedSerialTransformer,
+    )
+
+    class SquaringTransformer(NumberTransformer):
+        # A transformer with a custom process method, which prevents fusion
+
+        def transform(self, source_product: int) -> Iterator[int]:
+            yield source_product**2
+
+        def process(self, input: Iterable[int]) -> Iterator[int]:
+            return (product**2 for product in input)
+
+    doubling = DoublingTransformer()
+    incrementing = IncrementingTransformer()
+    squaring = SquaringTransformer()
+
+    left = (doubling >> incrementing) >> squaring
+    right = doubling >> (incrementing >> squaring)
+    for transformer in (left, right):
+        assert type(transformer) is _ChainedTransformer
+        assert transformer.transformers == (doubling, incrementing, squaring)
+        assert transformer.processor is squaring
+        assert tuple(transformer.source.chained_conduits) == (doubling, incrementing)
+        assert list(transformer.process([1, 2])) == [4, 9, 9, 25]
+        assert (NumberProducer(1, 3) >> transformer >> NumberConsumer()).run() == [
+            [4, 9, 9, 25]
+        ]
+
+    assert isinstance(
+        cast(_ChainedTransformer[int, int, int], left).source, _FusedSerialTransformer
+    )
+    assert freeze(left.to_expression()) == freeze(right.to_expression())
+
+    # chains of concurrent transformers with passthroughs connect the same conduits
+    # regardless of associativity
+    producer = NumberProducer(0, 2)
+    doubling_group = doubling & Passthrough()
+    incrementing_group = incrementing & Passthrough()
+    for flow in (
+        (producer >> doubling_group) >> incrementing_group,
+        producer >> (doubling_group >> incrementing_group),
+    ):
+        assert set(flow.get_final_conduits()) == {producer, doubling, incrementing}
+        assert set(flow.get_connections(ingoing=[])) == {
+            (producer, doubling),
+            (producer, incrementing),
+            (doubling, incrementing),
+        }
+
+
+def test_identity_elision() -> None:
+    """
+    Test that identity transformers are dropped when chained.
+    """
+
+    class IdentityTransformer(NumberTransformer):
+        _is_identity = True
+
+        def transform(self, source_product: int) -> Iterator[int]:
+            yield source_product
+
+    doubling = DoublingTransformer()
+    assert doubling >> IdentityTransformer() is doubling
+    assert IdentityTransformer() >> doubling is doubling
+
+    transformer = (
+        IdentityTransformer()
+        >> DoublingTransformer()
+        >> IdentityTransformer()
+        >> IncrementingTransformer()
+    )
+    assert tuple(type(conduit) for conduit in transformer.chained_conduits) == (
+        DoublingTransformer,
+        IncrementingTransformer,
+    )
+    assert list(transformer.process([1])) == [2, 3]
+
+    concurrent = DoublingTransformer() & IncrementingTransformer()
+    assert concurrent >> IdentityTransformer() is concurrent
+    assert IdentityTransformer() >> concurrent is concurrent
+
+    identity = IdentityTransformer()
+    assert identity >> IdentityTransformer() >> IdentityTransformer() is identity
+
+
+def test_repeated_concurrent_production() -> None:
+    """
+    Test that concurrent producers produce the same products on repeated runs.
+    """
+
+    group = NumberProducer(0, 2) & NumberProducer(10, 12)
+    expected_products = [0, 1, 10, 11]
+    assert list(group) == list(group) == expected_products
+
+    transformed_group = group >> (DoublingTransformer() & IncrementingTransformer())
+    expected_products = [0, 0, 1, 2, 1, 2, 10, 20, 11, 22, 11, 12]
+    assert list(transformed_group) == list(transformed_group) == expected_products
+
+
+def test_single_yield_transform() -> None:
+    """
+    Test that single-yield transformers are applied without generators, including
+    within fused chains.
+    """
+
+    class SquaringTransformer(NumberTransformer):
+        _single_yield = True
+
+        def transform(self, source_product: int) -> Iterator[int]:
+            yield self._transform_one(source_product)
+
+        def _transform_one(self, source_product: int) -> int:
+            return source_product * source_product
+
+    squaring = SquaringTransformer()
+    assert list(squaring.process([1, 2, 3])) == [1, 4, 9]
+    assert list(squaring.transform_batch([1, 2, 3])) == [1, 4, 9]
+
+    for transformer, expected_products in [
+        (DoublingTransformer() >> squaring >> IncrementingTransformer(), [2, 5]),
+        (DoublingTransformer() >> squaring, [1, 4]),
+        (squaring >> DoublingTransformer(), [1, 2]),
+        (squaring >> squaring, [1]),
+    ]:
+        assert list(transformer.process([1])) == expected_products
+        assert list(transformer.transform(1)) == expected_products
+
+    class FilteringTransformer(NumberTransformer):
+        # Wrongly declared as single-yield, since it drops odd products
+        _single_yield = True
+
+        def transform(self, source_product: int) -> Iterator[int]:
+            if source_product % 2 == 0:
+                yield source_product
+
+    for transformer in [
+        FilteringTransformer(),
+        DoublingTransformer() >> FilteringTransformer(),
+    ]:
+        with pytest.raises(
+            ValueError,
+            match=(
+                r"^Single-yield transformer FilteringTransformer must generate "
+                r"exactly one product, but generated no products for source product: 1$"
+            ),
+        ):
+            list(transformer.process([1, 2, 3]))
+
+
+def test_stop_iteration_in_transform() -> None:
+    """
+    Test that a StopIteration escaping a transform method raises an error instead of
+    silently ending the transformed products.
+    """
+
+    class StoppingTransformer(NumberTransformer):
+        # A transformer whose transform method is not a generator, and raises a
+        # StopIteration for source product 2
+
+        def transform(self, source_product: int) -> Iterator[int]:
+            if source_product == 2:
+                raise StopIteration
+            return iter([source_product])
+
+    class SingleYieldStoppingTransformer(StoppingTransformer):
+        _single_yield = True
+
+        def _transform_one(self, source_product: int) -> int:
+            return next(self.transform(source_product))
+
+    class BatchStoppingTransformer(StoppingTransformer):
+        def transform_batch(self, source_products: Collection[int]) -> list[int]:
+            return [next(self.transform(product)) for product in source_products]
+
+    transformers: list[SerialTransformer[int, int]] = [
+        StoppingTransformer(),
+        SingleYieldStoppingTransformer(),
+        BatchStoppingTransformer(),
+        DoublingTransformer() >> StoppingTransformer(),
+        DoublingTransformer() >> BatchStoppingTransformer(),
+    ]
+    for transformer in transformers:
+        with pytest.raises(RuntimeError):
+            list(transformer.process([1, 2, 3]))
+
+    group = StoppingTransformer() & IncrementingTransformer()
+    assert isinstance(group, ConcurrentTransformer)
+    with pytest.raises(RuntimeError):
+        list(group.process([1, 2, 3]))
+
+
+def test_batch_transform() -> None:
+    """
+    Test that transformers implementing a batch transform receive batched input.
+    """
+
+    class BatchIncrementingTransformer(NumberTransformer):
+        # An incrementing transformer that records the sizes of its batches
+
+        batch_size = 3
+
+        def __init__(self) -> None:
+            self.batch_sizes: list[int] = []
+
+        def transform(self, source_product: int) -> Iterator[int]:
+            yield source_product + 1
+
+        def transform_batch(self, source_products: Collection[int]) -> list[int]:
+            self.batch_sizes.append(len(source_products))
+            return [product + 1 for product in source_products]
+
+    incrementing = BatchIncrementingTransformer()
+    assert list(incrementing.process(range(7))) == [1, 2, 3, 4, 5, 6, 7]
+    assert incrementing.batch_sizes == [3, 3, 1]
+
+    incrementing = BatchIncrementingTransformer()
+    transformer = DoublingTransformer() >> incrementing >> DoublingTransformer()
+    assert (NumberProducer(0, 2) >> transformer >> NumberConsumer()).run() == [
+        [1, 2, 1, 2, 2, 4, 3, 6]
+    ]
+    # the doubling transformer doubles the batch of two products, which is then split
+    # to the batch size of the incrementing transformer
+    assert incrementing.batch_sizes == [3, 1]
+
+
+def test_vectorized_batch_transform() -> None:
+    """
+    Test that vectorized batch transforms hand over arrays between chained
+    transformers.
+    """
+
+    import numpy as np
+    import numpy.typing as npt
+
+    class VectorizedSquaringTransformer(NumberTransformer):
+        # A transformer that squares batches of products using NumPy arrays
+
+        def transform(self, source_product: int) -> Iterator[int]:
+            yield source_product**2
+
+        def transform_batch(
+            self, source_products: Collection[int]
+        ) -> npt.NDArray[np.int64]:
+            # chained transformers must pass on our arrays without unpacking them
+            if len(batches) % 2:
+                assert isinstance(source_products, np.ndarray)
+            batches.append(source_products)
+            return np.asarray(source_products, dtype=np.int64) ** 2
+
+    batches: list[Collection[int]] = []
+    transformer = VectorizedSquaringTransformer() >> VectorizedSquaringTransformer()
+    assert [int(x) for x in transformer.process(range(4))] == [0, 1, 16, 81]
+    assert len(batches) == 2
+
+
+def test_deep_flows() -> None:
+    """
+    Test a flow with a chain of 3000 steps, exceeding the default recursion limit.
+    """
+
+    producer: SerialProducer[int] = NumberProducer(0, 2)
+    for _ in range(3000):
+        producer = producer >> IncrementingTransformer()
+
+    assert sum(1 for _ in producer.chained_conduits) == 3001
+    assert isinstance(producer.to_expression(), Expression)
+
+
+def test_connections_of_dataclass_conduits() -> None:
+    """
+    Test that connections are determined for unhashable conduits, and are not shared
+    between equal conduits.
+    """
+
+    @dataclass
+    class UnhashableProducer(Producer[int]):
+        stop: int
+
+        def produce(self) -> Iterator[int]:
+            yield from range(self.stop)
+
+    @dataclass(frozen=True)
+    class FrozenProducer(Producer[int]):
+        stop: int
+
+        def produce(self) -> Iterator[int]:
+            yield from range(self.stop)
+
+    doubling = DoublingTransformer()
+    incrementing = IncrementingTransformer()
+    transformer = doubling >> incrementing
+
+    producer: SerialProducer[int] = UnhashableProducer(3)
+    assert list((producer >> transformer).get_connections(ingoing=[])) == [
+        (producer, doubling),
+        (doubling, incrementing),
+    ]
+
+    producer_a, producer_b = FrozenProducer(3), FrozenProducer(3)
+    assert producer_a == producer_b
+    for producer in (producer_a, producer_b):
+        connections = list((producer >> transformer).get_connections(ingoing=[]))
+        assert connections[0][0] is producer
+
+
+@pytest.mark.asyncio
+async def test_concurrent_aproduce() -> None:
+    """
+    Test bounded concurrent asynchronous iteration of producer groups.
+    """
+
+    class AsyncNumberProducer(AsyncProducer[int]):
+        # Produces a range of integers, yielding control after each product
+
+        def __init__(self, start: int, stop: int) -> None:
+            self.start = start
+            self.stop = stop
+
+        async def aproduce(self) -> AsyncIterator[int]:
+            for i in range(self.start, self.stop):
+                await asyncio.sleep(0)
+                if i < 0:
+                    raise ValueError("negative product")
+                yield i
+
+    class BoundedProducerGroup(SimpleConcurrentProducer[int]):
+        buffer_size = 1
+
+    group = BoundedProducerGroup(
+        AsyncNumberProducer(0, 5), AsyncNumberProducer(10, 15), NumberProducer(20, 22)
+    )
+    products = [product async for product in group]
+    assert sorted(products) == [0, 1, 2, 3, 4, 10, 11, 12, 13, 14, 20, 21]
+    # products of the async producers are interleaved
+    assert products != sorted(products)
+
+    group.num_workers = 1
+    assert [product async for product in group] == sorted(products)
+
+    group.num_workers = 0
+    with pytest.raises(
+        ValueError, match="^arg num_workers must be positive or None, but got: 0$"
+    ):
+        group.aproduce()
+    group.num_workers = None
+    group.buffer_size = 0
+    with pytest.raises(
+        ValueError, match="^arg buffer_size must be positive, but got: 0$"
+    ):
+        group.aproduce()
+
+    group = BoundedProducerGroup(AsyncNumberProducer(-1, 1), NumberProducer(0, 100))
+    with pytest.raises(ValueError, match="^negative product$"):
+        _ = [product async for product in group]
+
+    # errors are raised right away, without waiting for endless sibling producers
+    group = BoundedProducerGroup(
+        AsyncNumberProducer(-1, 1), AsyncNumberProducer(0, sys.maxsize)
+    )
+    with pytest.raises(ValueError, match="^negative product$"):
+        await asyncio.wait_for(_collect(group), timeout=10)
+    assert asyncio.all_tasks() == {asyncio.current_task()}
+
+    # cancellation errors not caused by the consumer are raised as well
+    class CancelledProducer(AsyncProducer[int]):
+        # Awaits a cancelled task before producing anything
+
+        async def aproduce(self) -> AsyncIterator[int]:
+            task = asyncio.ensure_future(asyncio.sleep(10))
+            task.cancel()
+            await task
+            yield 0
+
+    group = BoundedProducerGroup(CancelledProducer(), AsyncNumberProducer(0, 5))
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(_collect(group), timeout=10)
+    assert asyncio.all_tasks() == {asyncio.current_task()}
+
+    # closing the iterator early stops all workers, even if blocked on a full buffer
+    group = BoundedProducerGroup(
+        AsyncNumberProducer(0, 100), AsyncNumberProducer(100, 200)
+    )
+    products_iter = cast(AsyncGenerator[int, None], group.aproduce())
+    _ = [await anext(products_iter) for _ in range(3)]
+    await products_iter.aclose()
+    assert asyncio.all_tasks() == {asyncio.current_task()}
+
+
+async def _collect(products: AsyncIterable[int]) -> list[int]:
+    """
+    Collect the given products.
+
+    :param products: the products to collect
+    :return: the collected products
+    """
+    return [product async for product in products]